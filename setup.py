@@ -1,19 +1,26 @@
-# Add the `src/` folder to the path (on the front to avoid collisions with
-# previously installed versions
-import os
-import sys
+import ast
+
+# read the version straight from the source, importing `den` would pull in all
+# of its runtime dependencies at packaging time
+with open('src/den/__init__.py', 'r') as f:
+    version = next(
+        ast.literal_eval(node.value) for node in ast.parse(f.read()).body
+        if isinstance(node, ast.Assign) and
+        [getattr(target, "id", None) for target in node.targets] ==
+        ["__version__"])
 
-sys.path.insert(0, os.getcwd() + "/src/")
-import den
 # read in the README for the long description
 with open('README.md', 'r') as f:
     readme = f.read()
 
 from setuptools import setup
+# patches setuptools to write `console_scripts` launchers that import the entry
+# point directly instead of going through `pkg_resources`
+import fastentrypoints  # pylint: disable=unused-import
 
 setup(
     name="den",
-    version=den.__version__,
+    version=version,
     description="Command line utility for managing docker based development "
         "containers.",
     long_description=readme,
@@ -26,6 +33,7 @@ setup(
         "den": "src/den/",
         "den.commands": "src/den/commands/",
     },
+    python_requires=">=3.8",
     install_requires=[
         "click>=6.0",
         "docker>=2.7.0",
@@ -9,29 +9,36 @@ Config settings::
     debug=1  # equivalent to the `-d`//`--debug` flag on all calls
     verbosity=N  # equivalent to the number of `-v` flags set on all calls
 """
+import functools
 import logging
 import os.path
+import time
+from types import MappingProxyType
 
 import click
-import docker
 
 import den.log as den_log
 import den.utils as utils
 
-from den.config import Config
-
-CONTEXT_SETTINGS = {
-    "help_option_names": ["-h", "--help"],
-}
+# read-only and shared by every context click creates from it
+CONTEXT_SETTINGS = MappingProxyType({
+    "help_option_names": ("-h", "--help"),
+})
 LOCAL_CONFIG_FILE = ".den.ini"
-USER_CONFIG_FILE = (click.get_app_dir("den") + ".ini").replace(utils.HOME, "~")
-CONFIG_FILES = [LOCAL_CONFIG_FILE, USER_CONFIG_FILE]
+DENS_CACHE_TTL = 2  # seconds a den listing from the daemon is reused
 __version__ = "0.1"
 
+
+@functools.lru_cache(maxsize=None)
+def user_config_file():
+    """Location of the user's config file (resolved once, on first use)"""
+    return (click.get_app_dir("den") + ".ini").replace(utils.home(), "~")
+
+
 logging.setLoggerClass(den_log.ClickLogger)
 log = logging.getLogger(__name__)
 
-from den.commands.alias import AliasGroup  # pylint: disable=wrong-import-position
+from den.commands.alias import AliasGroup, ALIAS_SECTION  # pylint: disable=wrong-import-position
 
 
 class Context(object):
@@ -41,10 +48,18 @@ class Context(object):
     that commands will want without the specifics of their instantiation or
     definition being distributed among the commands.
     """
+    debug = False
+
     @utils.cached_property
     def config(self):  # pylint: disable=no-self-use
         """(cached property) Contextual configuration"""
-        return Config(*CONFIG_FILES)
+        from den.config import Config
+        return Config(LOCAL_CONFIG_FILE, user_config_file())
+
+    @utils.cached_property
+    def aliases(self):
+        """(cached property) Defined command aliases"""
+        return self.config.get_section(ALIAS_SECTION)
 
     @utils.cached_property
     def cwd(self):  # pylint: disable=no-self-use
@@ -53,7 +68,12 @@ class Context(object):
 
     @utils.cached_property
     def docker(self):  # pylint: disable=no-self-use
-        """(cached property) Docker client interface"""
+        """(cached property) Docker client interface
+
+        The docker SDK (and its `requests` stack) is only imported here so that
+        commands that never talk to the daemon don't pay for it on startup.
+        """
+        import docker
         return docker.from_env()
 
     @utils.cached_property
@@ -61,6 +81,33 @@ class Context(object):
         """(cached property) inferred project name"""
         return os.path.basename(self.cwd)
 
+    @utils.cached_property
+    def _dens(self):  # pylint: disable=no-self-use
+        """(cached property) Den listings, `running` -> (fetched, containers)"""
+        return {}
+
+    def dens(self, running=False):
+        """Den containers known to the docker daemon
+
+        The containers are the summaries from the daemon's listing (dicts with
+        `Names`, `State`, `Image`, ...) rather than `Container` objects, which
+        would need more requests to look up details like image tags.  Listings
+        are kept for a few seconds (separately for all vs. only running
+        dens) so repeated lookups don't each go to the daemon.  Commands that
+        change the dens drop them with `dens_changed`.
+        """
+        fetched, containers = self._dens.get(running, (None, None))
+        if fetched is None or time.monotonic() - fetched > DENS_CACHE_TTL:
+            containers = self.docker.api.containers(
+                all=not running, filters={"label": "den"})
+            self._dens[running] = (time.monotonic(), containers)
+
+        return containers
+
+    def dens_changed(self):
+        """Drop any cached den listing after the dens have been modified"""
+        self._dens.clear()
+
 
 @click.group("den", context_settings=CONTEXT_SETTINGS, cls=AliasGroup)
 @click.option("-v", "--verbose", count=True, help="Set verbose logging")
@@ -86,14 +133,14 @@ def den(context, verbose, debug):
 @den.command("version", short_help="Return the version of the installed den")
 def version():
     """Subcommand for giving the version number."""
-    log.echo("Den version {}".format(__version__))
+    log.echo("Den version " + __version__)
 
 
 def main():
     """Setup and call of the object"""
-    utils.bind_module("den.commands.dens", den)
-    utils.bind_module("den.commands.config", den)
-    utils.bind_module("den.commands.alias", den)
+    den.bind_lazy("den.commands.dens")
+    den.bind_lazy("den.commands.config")
+    den.bind_lazy("den.commands.alias")
     return den(obj=Context())  # pylint: disable=no-value-for-parameter,unexpected-keyword-arg
 
 
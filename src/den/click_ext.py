@@ -3,32 +3,72 @@
 Just a collection of extensions made to add additional functionality to click
 objects.
 """
+import bisect
+
 import click
 
+import den.utils as utils
+
 
 def find_unique_short(group, context, command_name):
     """Shorthand resolution
     Attempt to determine a shorthand expansion for a command, this will try and
     see if there is a unique command that starts with the `command_name` value
     and return it if there is, otherwise will return the options (`None` for
-    a complete miss).
+    a complete miss).  The (sorted) command list is binary searched for the
+    first candidate and only walked while the prefix keeps matching.
     """
-    possible_commands = [command for command in group.list_commands(context)
-                         if command.startswith(command_name)]
+    commands = group.list_commands(context)  # sorted, so matches are grouped
+    index = bisect.bisect_left(commands, command_name)
+    matches = []
+    while index < len(commands) and commands[index].startswith(command_name):
+        matches.append(commands[index])
+        index += 1
 
-    if len(possible_commands) == 1:
-        return click.Group.get_command(group, context, possible_commands[0])
+    if len(matches) == 1:
+        return click.Group.get_command(group, context, matches[0])
 
-    return possible_commands if possible_commands else None
+    return matches if matches else None
 
 
 class SmartGroup(click.Group):
     """Extended Group with some intelligent additions
 
     Collection of extended functionality added to the default `Group` object.
+    Command modules can be registered with `bind_lazy` so they are only
+    imported and bound the first time a lookup misses the already bound
+    commands (or the full listing is needed).
     """
+    def __init__(self, *args, **kwargs):
+        click.Group.__init__(self, *args, **kwargs)
+        self.lazy_modules = []
+        self._sorted_commands = None
+
+    def bind_lazy(self, module_name):
+        """Register a command module to be bound on demand"""
+        self.lazy_modules.append(module_name)
+
+    def _bind_pending(self):
+        """Bind any registered but not yet imported command modules"""
+        if self.lazy_modules:
+            pending, self.lazy_modules = self.lazy_modules, []
+            utils.bind_modules(pending, self)
+
+    def add_command(self, cmd, name=None):
+        click.Group.add_command(self, cmd, name)
+        self._sorted_commands = None
+
+    def list_commands(self, ctx):
+        self._bind_pending()
+        if self._sorted_commands is None:
+            self._sorted_commands = click.Group.list_commands(self, ctx)
+        return self._sorted_commands
+
     def get_command(self, ctx, cmd_name):
         command = click.Group.get_command(self, ctx, cmd_name)
+        if command is None and self.lazy_modules:
+            self._bind_pending()
+            command = click.Group.get_command(self, ctx, cmd_name)
         if command is not None:
             return command
 
@@ -15,35 +15,37 @@ Additional commands exist to interact with the aliases, but they are basically
 re-wraps of the `config` group of commands.
 """
 import logging
-import os
 
 import click
 
-from .config import get_value, set_value, \
-        MissingConfigurationException
-from .. import LOCAL_CONFIG_FILE, USER_CONFIG_FILE
 from ..click_ext import SmartGroup
 
 log = logging.getLogger(__name__)
 
 ALIAS_SECTION = "alias"
 __commands__ = ["interact_alias"]
-ALIAS_OUTPUT_FORMAT = "`den {key}` is aliased to `den {value}`"
 
 
 def find(context, alias):
     """Lookup command alias
 
     Retrieves the expanded command when provided with the application context
-    and the alias desired.  Will return `None` if no alias is defined.
+    and the alias desired.  Will return `None` if no alias is defined.  The
+    aliases are read from the config once and kept on the context.
     """
-    if not hasattr(context, "config"):
+    aliases = getattr(context, "aliases", None)
+    if not aliases:
         return None
 
-    expansion = context.config.get(ALIAS_SECTION, alias)
+    expansion = aliases.get(alias.lower())
     return expansion.split(' ') if expansion else None
 
 
+def _alias_output(_, alias, expansion):
+    """Output line for an alias lookup"""
+    return "`den %s` is aliased to `den %s`" % (alias, expansion)
+
+
 class AliasGroup(SmartGroup):
     """Extended SmartGroup with aliasing support
 
@@ -67,8 +69,7 @@ class AliasGroup(SmartGroup):
 class NoAliasException(click.ClickException):
     """Exception raised when an alias lookup fails. """
     def __init__(self, alias):
-        click.ClickException.__init__(self, "No `{}` alias "
-                                      "defined.".format(alias))
+        click.ClickException.__init__(self, "No `%s` alias defined." % alias)
 
 
 # > den alias <alias> [<command>]
@@ -87,8 +88,12 @@ def interact_alias(context, user, alias, command):
     acts as a command expansion: `den alias crst -- create --start` would mean
     that `den crst` would be expanded to `den create --start`.
     """
-    context.obj.target_config = os.path.expanduser(USER_CONFIG_FILE) if user \
-            else os.path.join(context.obj.cwd, LOCAL_CONFIG_FILE)
+    # the config command set is only needed once the command actually runs,
+    # `den` itself imports this module for `AliasGroup`
+    from .config import get_value, set_value, target_config, \
+        MissingConfigurationException
+
+    context.obj.target_config = target_config(context.obj.cwd, user)
 
     if command:
         context.invoke(set_value, section=[ALIAS_SECTION, alias],
@@ -96,6 +101,6 @@ def interact_alias(context, user, alias, command):
     else:
         try:
             context.invoke(get_value, section=ALIAS_SECTION, key=alias,
-                           output_format=ALIAS_OUTPUT_FORMAT)
+                           formatter=_alias_output)
         except MissingConfigurationException:
             raise NoAliasException(alias)
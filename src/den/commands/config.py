@@ -4,22 +4,20 @@ These are to allow a CLI system for reading and writing to the config files.
 There are two targets for each action, the default "local" config and the
 "user" config (which lives in the user's home).
 """
-try:
-    import ConfigParser
-except ImportError:
-    import configparser as ConfigParser
-import contextlib
+import functools
+import io
 import logging
 import os.path
 
 import click
 
-from .. import LOCAL_CONFIG_FILE, USER_CONFIG_FILE
+from .. import LOCAL_CONFIG_FILE, user_config_file
+from .. import utils
 from ..click_ext import SmartGroup
+from ..config import clear_cache, read_ini, section_options
 
 __commands__ = ["config_group"]
 
-GET_OUTPUT_FORMAT = "{section}.{key} = {value}"
 log = logging.getLogger(__name__)
 
 
@@ -33,46 +31,80 @@ class MissingConfigurationException(click.ClickException):
         click.ClickException.__init__(self, msg)
 
 
+@functools.lru_cache(maxsize=256)
 def _expand(section, key=None, key_required=True):
     """Section//Key expansion utility
 
     Will get the section and key target in a config from the provided values.
     This will be the two values if they are defined, expanding the `section`
     value if it is of the `section.key` format, or falling back to a configured
-    style (either failing or returning just the section).
+    style (either failing or returning just the section).  Results are
+    memoized (failures raise and so are never cached).
     """
-    if not key and "." not in section:
-        if key_required:
-            raise click.BadParameter("You need to specify a section and a key "
-                                     "(or `section.key`).",
-                                     param_hint="SECTION [KEY]")
-        else:
-            return section, None
-    elif not key:
-        section, key = section.split(".", 1)
+    if key:
+        return section, key
 
-    return section, key
+    head, dot, tail = section.partition(".")
+    if dot:
+        return head, tail
 
+    if key_required:
+        raise click.BadParameter("You need to specify a section and a key "
+                                 "(or `section.key`).",
+                                 param_hint="SECTION [KEY]")
+    return section, None
 
-@contextlib.contextmanager
-def _modify_config(config_file):
-    """Config modification context
 
-    Allows for creating a temporary `ConfigParser` to modify and then save the
-    newly modified config file.
-    """
-    parser = ConfigParser.ConfigParser()
-    if os.path.exists(config_file):
-        with open(config_file, "r") as f:
-            if hasattr(parser, "read_file"):
-                getattr(parser, "read_file")(f)
-            else:
-                getattr(parser, "readfp")(f)
+def _option_output(section, key, value):
+    """Output line for a config value lookup"""
+    return "%s.%s = %s" % (section, key, value)
 
-    yield parser
 
-    with open(config_file, "w") as f:
-        parser.write(f)
+class _ModifyConfig(object):
+    """Config modification context
+
+    Allows for creating a temporary `RawConfigParser` to modify and then save
+    the newly modified config file (dropping the cached parse of the configs).
+    Values are kept as written, without `%` interpolation, matching how they
+    are read back.  The new contents replace the file in one step, so an
+    interrupted write never leaves a truncated config behind.  Nothing is
+    written if the context exits with an error.
+    """
+    def __init__(self, config_file):
+        self.config_file = config_file
+        self.parser = None
+
+    def __enter__(self):
+        import configparser  # only writes need the full parser
+
+        self.parser = configparser.RawConfigParser()
+        try:
+            with open(self.config_file, "r") as f:
+                self.parser.read_string(f.read(), self.config_file)
+        except FileNotFoundError:
+            pass  # new config file, starts out empty
+
+        return self.parser
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            buf = io.StringIO()  # the parser writes piecemeal, write it once
+            self.parser.write(buf)
+            with utils.atomic_write(self.config_file) as f:
+                f.write(buf.getvalue())
+            clear_cache()
+
+
+@functools.lru_cache(maxsize=None)
+def target_config(cwd, user=False):
+    """Resolved path of the config file to act on
+
+    The "user" config file if `user` is set, otherwise the "local" one in the
+    `cwd` directory.  The path is fully resolved (home expanded, symlinks
+    followed) so every command refers to a file by the same path.
+    """
+    return os.path.realpath(os.path.expanduser(user_config_file()) if user
+                            else os.path.join(cwd, LOCAL_CONFIG_FILE))
 
 
 CONFIG_HELP = """Interact with the den configuration values
@@ -80,7 +112,7 @@ CONFIG_HELP = """Interact with the den configuration values
 By default, looks at the "local" configuration file (located at {}) for
 interactions.  If the "user" configuration file is chosen, will use the file
 located at {} instead.
-""".format(LOCAL_CONFIG_FILE, USER_CONFIG_FILE)
+""".format(LOCAL_CONFIG_FILE, user_config_file())
 
 
 # > den config <...>
@@ -92,8 +124,7 @@ located at {} instead.
 def config_group(context, user):
     """Group for config interactions.
     """
-    context.target_config = os.path.expanduser(USER_CONFIG_FILE) if user \
-            else os.path.join(context.cwd, LOCAL_CONFIG_FILE)
+    context.target_config = target_config(context.cwd, user)
 
 
 # > den config get <section> [<key>]
@@ -101,7 +132,7 @@ def config_group(context, user):
 @click.argument("section")  # Name of section to get
 @click.argument("key", required=False, default=None)  # Name of the key
 @click.pass_obj
-def get_value(context, section, key, output_format=GET_OUTPUT_FORMAT):
+def get_value(context, section, key, formatter=_option_output):
     """Retrieve the value in a config
 
     Will return all values under SECTION if just SECTION is defined, otherwise
@@ -109,21 +140,17 @@ def get_value(context, section, key, output_format=GET_OUTPUT_FORMAT):
     """
     section, key = _expand(section, key, key_required=False)
 
-    parser = ConfigParser.ConfigParser()
-    parser.read(context.target_config)
-
-    try:
-        if key:
-            value = parser.get(section, key)
-            log.echo(output_format.format(section=section, key=key,
-                                          value=value))
-        else:
-            for k, v in parser.items(section):
-                log.echo(output_format.format(section=section, key=k, value=v))
-    except ConfigParser.NoSectionError:
+    options = section_options(read_ini(context.target_config), section)
+    if options is None:
         raise MissingConfigurationException(section)
-    except ConfigParser.NoOptionError:
-        raise MissingConfigurationException(section, key)
+
+    if key:
+        if key.lower() not in options:
+            raise MissingConfigurationException(section, key)
+        log.echo(formatter(section, key, options[key.lower()]))
+    elif options:  # written out in one go rather than a write per option
+        log.echo("\n".join(formatter(section, k, v)
+                           for k, v in options.items()))
 
 
 # > den config set <section> [<key>] <value>
@@ -138,7 +165,7 @@ def set_value(context, section, value):
     """
     section, key = _expand(*section)
 
-    with _modify_config(context.target_config) as parser:
+    with _ModifyConfig(context.target_config) as parser:
         if not parser.has_section(section):
             parser.add_section(section)
 
@@ -160,7 +187,7 @@ def delete(context, section, key):
         click.confirm("This will delete the entire `{}` "
                       "section.".format(section), abort=True, default=True)
 
-    with _modify_config(context.target_config) as parser:
+    with _ModifyConfig(context.target_config) as parser:
         if key:
             log.echo("Removing {}.{}.".format(section, key))
             parser.remove_option(section, key)
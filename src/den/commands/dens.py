@@ -18,8 +18,8 @@ Config settings::
 """
 import logging
 import os
-
-from os.path import expanduser
+import shlex
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import click
 
@@ -28,13 +28,15 @@ from .. import utils
 
 log = logging.getLogger(__name__)
 
-DOCKER_CREATE_CMD = ("docker create --hostname {name} --interactive "
-                     "--label den --name {name} --tty --volume "
-                     "{cwd}:/src{extra_args} {image}")
+# creating and starting go through the CLI (volume mounts and attaching the
+# terminal respectively), the rest of the den management uses the API
 DOCKER_START_CMD = "docker start --attach --interactive {name}"
-DOCKER_STOP_CMD = "docker stop --time 1 {name}"
-DOCKER_DELETE_CMD = "docker rm --force {name}"
-HOME = expanduser("~")
+STOP_TIMEOUT = 1  # seconds a den gets to shut down before being killed
+REMOVE_WORKERS = 8  # concurrent removals, within docker-py's connection pool
+# `docker create` arguments for the optional mounts
+SSH_AGENT_SOCK = "/var/run/ssh_agent.sock"
+WITH_DOCKER_ARGS = ("--volume", "/var/run/docker.sock:/var/run/docker.sock")
+WITH_SSH_ENV_ARGS = ("--env", "SSH_AUTH_SOCK=" + SSH_AGENT_SOCK)
 
 __commands__ = ["create_den", "start_den", "stop_den", "delete_den",
                 "list_dens"]
@@ -50,6 +52,56 @@ class UndefinedImageException(click.ClickException):
             self, "There is no defined image to build off of.")
 
 
+def _docker_create_args(name, cwd, image, extra_args, cmd):
+    """Argument list for the `docker create` call of a den
+
+    Built as a list (rather than a command string) so values like paths with
+    spaces in them reach docker as single arguments.
+    """
+    return ["docker", "create", "--hostname", name, "--interactive",
+            "--label", "den", "--name", name, "--tty",
+            "--volume", cwd + ":/src"] + extra_args + [image] + cmd
+
+
+def _den_name(container):
+    """Name of a den from its listing summary"""
+    return container["Names"][0].lstrip("/")
+
+
+def _den_image(container):
+    """Image of a den from its listing summary (shortened if just an ID)"""
+    image = container["Image"]
+    return image[:17] if image.startswith("sha256:") else image
+
+
+def _remove_containers(api, names):
+    """Force remove the named containers, returning each one's error (if any)
+
+    Multiple containers are removed concurrently, each removal is a separate
+    request to the daemon and most of the time is spent waiting on it.  The
+    result maps every name to a `DockerAPIException` if the daemon rejected its
+    removal, or `None` if it was removed.
+    """
+    from docker.errors import APIError
+
+    def remove(name):
+        """Remove a single container"""
+        try:
+            api.remove_container(name, force=True)
+        except APIError as error:
+            return utils.DockerAPIException(error)
+        return None
+
+    if len(names) == 1:
+        return {names[0]: remove(names[0])}
+
+    with ThreadPoolExecutor(
+            max_workers=min(len(names), REMOVE_WORKERS)) as pool:
+        futures = {pool.submit(remove, name): name for name in names}
+        return {futures[future]: future.result()
+                for future in as_completed(futures)}
+
+
 # > den create [OPTIONS] [<name>] [-- <cmd>]
 @click.command("create", short_help="Create a new den")
 @click.option("-s", "--start", is_flag=True, default=False,
@@ -83,47 +135,41 @@ def create_den(context, start, image,  # pylint: disable=too-many-arguments
 
     name = name if name else context.config.get(
         "image", "name", context.default_name)
-    cmd = cmd if cmd else context.config.get("image", "command")
+    cmd = list(cmd) if cmd else \
+        shlex.split(context.config.get("image", "command", ""))
     cwd = (context.cwd + "/") if not context.cwd.endswith("/") else context.cwd
-    extra_args = [""]
-
-    if isinstance(cmd, (tuple, list)):
-        cmd = " ".join(cmd)
+    extra_args = []
 
     if with_docker:
-        extra_args.append("--volume "
-                          "/var/run/docker.sock:/var/run/docker.sock")
-        extra_args.append("--volume " +
-                          HOME + "/.docker:/root/.docker")
+        extra_args.extend(WITH_DOCKER_ARGS)
+        extra_args.extend(("--volume",
+                           utils.home() + "/.docker:/root/.docker"))
     if with_ssh:
         ssh_agent = os.environ.get("SSH_AUTH_SOCK", None)
         if not ssh_agent:
             log.warn("No ssh agent to mount, skipping")
         else:
-            extra_args.append("--volume " +
-                              ssh_agent + ":/var/run/ssh_agent.sock")
-            extra_args.append("--env "
-                              "SSH_AUTH_SOCK=/var/run/ssh_agent.sock")
+            extra_args.extend(("--volume", ssh_agent + ":" + SSH_AGENT_SOCK))
+            extra_args.extend(WITH_SSH_ENV_ARGS)
     if device:
-        extra_args.append("--device " + device)
+        extra_args.extend(["--device", device])
 
-    for guest, host in context.config.get_section("ports").items():
-        extra_args.append(
-            "--publish {}:{}".format(guest, host) if host else str(guest))
+    extra_args.extend(
+        arg for guest, host in context.config.iter_section("ports")
+        for arg in (("--publish", guest + ":" + host) if host else (guest,)))
 
     # NOTE: tried to do creation using the API but volume mounting didn't work
-    cmd = " {}".format(cmd) if cmd else ""
     with log.report_success(
         "Creating den environment `{}` with `{}` base"
         .format(name, image if not use_default else "default"),
         debug=context.debug
     ):
-        shell.run(DOCKER_CREATE_CMD.format(
-            name=name, cwd=cwd, image=image,
-            extra_args=" ".join(extra_args)) + cmd, quiet=shell.ALL)
+        shell.run(_docker_create_args(name, cwd, image, extra_args, cmd),
+                  quiet=shell.ALL)
+    context.dens_changed()
 
     if start:
-        start_den.callback(name)
+        start_den.callback(name=name)
 
 
 # > den start [<name>]
@@ -135,8 +181,9 @@ def start_den(context, name):
     """
     name = name if name else context.default_name
     log.echo("Starting `{}` environment...".format(name))
-    shell.run(DOCKER_START_CMD.format(**locals()), interactive=True,
+    shell.run(DOCKER_START_CMD.format(name=name), interactive=True,
               suppress=True)
+    context.dens_changed()
 
 
 # > den stop [<name>]
@@ -145,6 +192,7 @@ def start_den(context, name):
               help="Delete the den after stopping it")
 @click.argument("name", required=False, default=None)  # Name for the den
 @click.pass_obj
+@utils.uses_docker
 def stop_den(context, delete, name=None):
     """Stops the specified develoment den
     """
@@ -155,10 +203,12 @@ def stop_den(context, delete, name=None):
     name = name if name else context.default_name
     with log.report_success("Spinning down `{}` environment".format(name),
                             debug=context.debug):
-        shell.run(DOCKER_STOP_CMD.format(**locals()), quiet=shell.ALL)
+        with utils.docker_errors():
+            context.docker.api.stop(name, timeout=STOP_TIMEOUT)
+    context.dens_changed()
 
     if delete:
-        delete_den.callback([name])
+        delete_den.callback(all=False, names=[name])
 
 
 # > den delete [<name>]
@@ -172,24 +222,28 @@ def stop_den(context, delete, name=None):
 def delete_den(context, all, names):  # pylint: disable=redefined-builtin
     """Deletes the specified development den(s)
 
-    Will attempt to delete the specified dens.
+    Will attempt to delete the specified dens (forcing running ones down).
     """
     if all:
-        den_filter = {"all": True, "filters": {"label": "den"}}
-        names = [container.name for container
-                 in context.docker.containers.list(**den_filter)]
+        names = [_den_name(container) for container in context.dens()]
         if names:
             click.confirm("This will delete the containers: "
                           "{}".format(", ".join(names)), abort=True)
     elif not names:
         names = [context.default_name]
 
+    if not names:
+        return
+
+    # the client is created here, not racing to in the removal threads
+    errors = _remove_containers(context.docker.api, names)
+    context.dens_changed()
+
     for name in names:
-        with log.report_success(
-            "Removing the `{}` environment".format(name),
-            debug=context.debug, abort=False
-        ):
-            shell.run(DOCKER_DELETE_CMD.format(**locals()), quiet=shell.ALL)
+        with log.report_success("Removing the `{}` environment".format(name),
+                                debug=context.debug, abort=False):
+            if errors[name] is not None:
+                raise errors[name]
 
 
 # > den list
@@ -204,19 +258,14 @@ def list_dens(context, running):
     Filters based on the metadata label applied and gives a simple summary of
     the state of containers running.
     """
-    kwargs = {
-        "all": not running,
-        "filters": {"label": "den"}
-    }
-    output = [["NAME", "STATUS", "IMAGE"]]
-    containers = context.docker.containers.list(**kwargs)
+    containers = context.dens(running)
     log.info("Found %d containers.", len(containers))
 
-    for container in containers:
-        log.debug("`%s` has tags `%s`",
-                  container.name, ",".join(container.image.tags))
-        tag = container.image.tags[0] if container.image.tags \
-            else container.image.short_id
-        output.append([container.name, container.status, tag])
+    def rows():
+        """Table rows, header first, for the found containers"""
+        yield ["NAME", "STATUS", "IMAGE"]
+        for container in containers:
+            yield [_den_name(container), container["State"],
+                   _den_image(container)]
 
-    log.echo("\n".join(utils.align_table(output, min_length=8)))
+    log.echo("\n".join(utils.align_table(rows(), min_length=8)))
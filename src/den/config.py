@@ -1,28 +1,112 @@
 """Config interaction definition
 
-Defines helpful wrappers around the `ConfigParser` system to obfuscate some of
-the common patterns with interacting with variable system configurations and
-resolution states.
+Defines helpful wrappers around reading the ini formatted config files to
+obfuscate some of the common patterns with interacting with variable system
+configurations and resolution states.  Reading is done with a minimal ini
+scanner rather than `ConfigParser` (which is only needed for writing), the
+configs are just `[section]` headers and `key = value` pairs.  Like
+`ConfigParser`, the options of a `[DEFAULT]` section apply to every section.
+
+Parsed files are kept in memory (along with the modification time and size of
+the file) so repeated reads in one process skip parsing until the file changes.
 """
-try:
-    import ConfigParser
-except ImportError:
-    import configparser as ConfigParser
+import os
 import os.path
 
 import den.utils as utils
 
+DEFAULT_SECTION = "DEFAULT"  # options shared by every section (`ConfigParser`)
+_PARSED = {}  # path -> (fingerprint, sections) for `read_ini`
+
+
+def _fingerprint(path):
+    """Identifying state of a config file for cache invalidation"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (path, None, None)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def read_ini(path):
+    """Parse an ini file into a dict of sections of key value pairs
+
+    Handles the subset of the `ConfigParser` format the configs use: comment
+    lines (`#` or `;`), `[section]` headers, `key = value` (or `key: value`)
+    options with lowercased keys, and indented continuation lines.  A missing
+    file is treated as empty.  The `[DEFAULT]` section is returned as is, use
+    `section_options` to look up a section with its defaults filled in.
+
+    Results are kept for the life of the process as long as the file's state
+    doesn't change, so they are shared and should not be modified.
+    """
+    fingerprint = _fingerprint(os.path.abspath(path))
+    cached = _PARSED.get(fingerprint[0])
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    sections = _parse_ini(path)
+    _PARSED[fingerprint[0]] = (fingerprint, sections)
+    return sections
+
+
+def _parse_ini(path):
+    """Uncached parsing for `read_ini`"""
+    sections = {}
+    try:
+        with open(path, "r") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return sections
+
+    section = key = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped[0] in "#;":
+            continue
+        if line[0].isspace() and key is not None:  # continuation line
+            sections[section][key] += "\n" + stripped
+        elif stripped[0] == "[" and stripped[-1] == "]":
+            section = stripped[1:-1]
+            sections.setdefault(section, {})
+            key = None
+        elif section is not None:
+            key, _, value = stripped.partition("=")
+            if ":" in key:  # `key: value` style option
+                key, _, value = stripped.partition(":")
+            key = key.strip().lower()
+            sections[section][key] = value.strip()
+
+    return sections
+
+
+def section_options(sections, section):
+    """A section's options from `read_ini` with the `[DEFAULT]` ones filled in
+
+    Returns `None` if the section isn't defined.
+    """
+    options = sections.get(section)
+    defaults = sections.get(DEFAULT_SECTION)
+    if options is None or not defaults:
+        return options
+    return dict(defaults, **options)
+
+
+def clear_cache():
+    """Forget the parsed config files"""
+    _PARSED.clear()
+
 
 class Config(object):
-    """ConfigParser wrapper
+    """Config file hierarchy wrapper
 
-    Wraps the ConfigParser.ConfigParser class with some sane utility additions.
-    These include default key values from missing config settings (instead of
-    throwing an error) and existance checks when adding config files to be read
-    from.
+    Reads the config files (later files overriding earlier ones) with some sane
+    utility additions.  These include default key values from missing config
+    settings (instead of throwing an error) and existance checks when adding
+    config files to be read from.
     """
     def __init__(self, *files):
-        self.parser = ConfigParser.ConfigParser()
+        self.sections = {}
         base = None
 
         for f in files:
@@ -33,8 +117,16 @@ class Config(object):
             else:
                 f = os.path.expanduser(f)
 
-            if os.path.exists(f):
-                self.parser.read(f)
+            # missing files read as empty, so no separate existence check
+            for section, options in read_ini(f).items():
+                self.sections.setdefault(section, {}).update(options)
+
+        # defaults apply across all of the files, but never over a set option
+        defaults = self.sections.get(DEFAULT_SECTION)
+        if defaults:
+            for options in self.sections.values():
+                for key, value in defaults.items():
+                    options.setdefault(key, value)
 
     def get(self, section, key, default=None):
         """Value lookup with default value
@@ -42,16 +134,13 @@ class Config(object):
         Performs the section::key lookup in the config file hiearchy and will
         return the specified default value if there is no key defined.
         """
-        try:
-            return self.parser.get(section, key)
-        except ConfigParser.NoSectionError:
-            return default
-        except ConfigParser.NoOptionError:
-            return default
+        return self.sections.get(section, {}).get(key.lower(), default)
 
     def get_section(self, section):
         """Get dict of a section's key value pairs"""
-        try:
-            return dict(self.parser.items(section))
-        except ConfigParser.NoSectionError:
-            return {}
+        return dict(self.sections.get(section, {}))
+
+    def iter_section(self, section):
+        """Iterate over a section's key value pairs (without copying them)"""
+        options = self.sections.get(section)
+        return iter(options.items() if options else ())
@@ -4,19 +4,20 @@ Wraps log output to allow for dictating log levels and provide some helpers for
 pretty printing output to the command line.
 """
 import contextlib
+import functools
 import logging
-import re
 import sys
 
 import click
 
 from colorama import Fore, init
+from colorama.ansitowin32 import StreamWrapper
 
-init()
+# colorama wraps the output streams (when it needs to translate or strip the
+# color codes), only do it once even if this module is loaded again
+if not isinstance(sys.stdout, StreamWrapper):
+    init()
 
-SUBSTITUTIONS = [
-    (re.compile(r"\`([^\`]*)\`"), Fore.CYAN + r"\1" + Fore.RESET),
-]
 CODE_COLOR = Fore.CYAN
 VERBOSITY_LEVEL = [
     logging.CRITICAL,
@@ -27,14 +28,46 @@ VERBOSITY_LEVEL = [
 ]
 
 
+def _color_code(msg):
+    """Color the `code` spans (text between a pair of backticks) of a message
+
+    Jumps between the backticks with `str.find` rather than using a regex, an
+    unpaired backtick is left as is.
+    """
+    parts = []
+    start = 0
+    while True:
+        opening = msg.find("`", start)
+        closing = msg.find("`", opening + 1) if opening >= 0 else -1
+        if closing < 0:
+            break
+
+        parts.extend((msg[start:opening], CODE_COLOR,
+                      msg[opening + 1:closing], Fore.RESET))
+        start = closing + 1
+
+    parts.append(msg[start:])
+    return "".join(parts)
+
+
+# (trigger, substitution), the substitution is only run on messages that
+# contain its trigger
+SUBSTITUTIONS = [
+    ("`", _color_code),
+]
+
+
+@functools.lru_cache(maxsize=256)
 def _format(msg):
     """Format message using clean substitutions
 
     These use some colorama options to fix emphasis or other markings for a
-    richer output format.
+    richer output format.  Results are memoized, as the same messages tend to
+    be repeated.
     """
-    for pattern, replace in SUBSTITUTIONS:
-        msg = re.sub(pattern, replace, msg)
+    for trigger, substitute in SUBSTITUTIONS:
+        if trigger in msg:  # much cheaper than a substitution that misses
+            msg = substitute(msg)
     return msg
 
 
@@ -66,17 +99,27 @@ class ClickFormatter(logging.Formatter):
             fmt = self.DEFAULT_FORMAT
 
         logging.Formatter.__init__(self, fmt=fmt, **kwargs)
+        # the colored level names only need to be put together once
+        self.level_names = {
+            level: self.COLORS[level] + alias + Fore.RESET
+            for level, alias in self.ALIASES.items()
+        }
+        # with the default format, the whole line is just prefix + message
+        self.level_prefixes = {
+            level: name + " - " for level, name in self.level_names.items()
+        } if fmt == self.DEFAULT_FORMAT else None
 
     def format(self, record):
         """Performs nicer console output formatting for the output message
         """
         msg = _format(record.getMessage())
-        record.getMessage = lambda: msg
-        record.levelname = (
-            self.COLORS[record.levelno] +
-            self.ALIASES[record.levelno] +
-            Fore.RESET
-        )
+        if self.level_prefixes is not None and \
+                not (record.exc_info or record.exc_text or record.stack_info):
+            return self.level_prefixes[record.levelno] + msg
+
+        # store the finished message rather than overriding `getMessage`
+        record.msg, record.args = msg, ()
+        record.levelname = self.level_names[record.levelno]
         return logging.Formatter.format(self, record)
 
 
@@ -4,11 +4,10 @@ Provides various ways to interact with the shell, between calling a command to
 finish, calling a command and attaching the current shell to it, capturing the
 output of a command, or just checking if a command lives in the $PATH.
 """
-import distutils.spawn  # pylint: disable=no-name-in-module,import-error
+import functools
 import logging
 import os
 import subprocess
-import sys
 
 from click import ClickException
 
@@ -17,11 +16,7 @@ log = logging.getLogger(__name__)
 STDOUT = 1
 STDERR = 2
 ALL = STDOUT | STDERR
-
-if hasattr(subprocess, "DEVNULL"):
-    DEVNULL = getattr(subprocess, "DEVNULL")
-else:
-    DEVNULL = os.open(os.devnull, os.O_RDWR)  # Taken from the 3.x codebase
+DEVNULL = subprocess.DEVNULL
 
 
 class CommandFailure(ClickException):
@@ -36,17 +31,36 @@ class CommandFailure(ClickException):
         ClickException.__init__(self, msg)
 
 
+@functools.lru_cache(maxsize=64)
+def _split_cmd(cmd):
+    """Arguments of a command string (memoized, so returned as a tuple)"""
+    return tuple(cmd.split())
+
+
 def run(cmd, interactive=False, quiet=0, cwd=None, env=None,  # pylint: disable=too-many-arguments
         wait=True, suppress=False):  # pylint: disable=too-many-arguments
     """Run the command in a subprocess shell
 
+    The command is either a string (split on whitespace) or a list of
+    arguments, which are passed straight through and so can contain spaces.
     Can be configured how the command is handled with quietting the stderr or
     stdout output streams (defaults to the current shell's), running it
     interactively (which hooks all three of the current stdin, stdout, and
     stderr to the command), set additional environment variables, change the
     current directory of the command, and whether to wait for the command to
     finish.
+
+    The streams are inherited rather than passed explicitly, and the
+    executable is looked up (memoized) on the same search path `subprocess`
+    would use, the `env` one if that is set.  A missing command raises a
+    `FileNotFoundError`.
     """
+    if isinstance(cmd, (list, tuple)):
+        args = list(cmd)
+        cmd = " ".join(cmd)
+    else:
+        args = _split_cmd(cmd)
+
     if interactive:  # don't quiet the output streams interactively
         log.debug("Running command `%s` interactively.", cmd)
         quiet = 0
@@ -55,12 +69,12 @@ def run(cmd, interactive=False, quiet=0, cwd=None, env=None,  # pylint: disable=
         log.debug("Running command `%s`.", cmd)
 
     action = subprocess.Popen(
-        cmd.split(' '),
+        args,
+        executable=_which(args[0], os.pathsep.join(os.get_exec_path(env))),
         cwd=cwd,
         env=env,
-        stdin=sys.stdin if interactive else None,
-        stdout=DEVNULL if quiet & STDOUT else sys.stdout,
-        stderr=DEVNULL if quiet & STDERR else sys.stderr,
+        stdout=DEVNULL if quiet & STDOUT else None,
+        stderr=DEVNULL if quiet & STDERR else None,
     )
 
     if not wait:
@@ -78,17 +92,22 @@ def run(cmd, interactive=False, quiet=0, cwd=None, env=None,  # pylint: disable=
 
 def output(cmd, **kwargs):
     """Run the supplied command and return the lines of output."""
-    return subprocess.check_output(cmd.split(' '), **kwargs)\
-            .strip().split('\n')
+    return subprocess.check_output(_split_cmd(cmd), universal_newlines=True,
+                                   **kwargs).strip().splitlines()
 
 
-# NOTE: this is not the best option, but works for 2.7, shutils.which is
-#       preferred but is only in 3.3+
 def is_installed(command):
     """Checks if the specified executable exists on the path
 
     Useful for checking install dependencies or giving better feedback on a
     command failure (because the executable doesn't exist) instead of a generic
-    failure message.
+    failure message.  Lookups are memoized for as long as `$PATH` is the same.
     """
-    return distutils.spawn.find_executable(command)  # pylint: disable=no-member
+    return _which(command, os.environ.get("PATH"))
+
+
+@functools.lru_cache(maxsize=128)
+def _which(command, path):
+    """Memoized `shutil.which` for `run` and `is_installed`"""
+    import shutil
+    return shutil.which(command, path=path)
@@ -7,6 +7,17 @@ class TestContext(object):
     cwd = "/test"
     debug = True
 
+    @property
+    def aliases(self):
+        return self.config.get_section("alias")
+
+    def dens(self, running=False):
+        return self.docker.api.containers(
+            all=not running, filters={"label": "den"})
+
+    def dens_changed(self):
+        pass
+
     @property
     def docker(self):
         if not hasattr(self, "_docker"):
@@ -16,15 +27,17 @@ class TestContext(object):
 
 
 class TestConfig(object):
+    __slots__ = ("_values",)
+
     def __init__(self, **values):
         self._values = values
 
     def get(self, section, key, default=None):
-        _section = self._values.get(section, None)
-        if not _section:
-            return default
-
-        return _section.get(key, default)
+        _section = self._values.get(section)
+        return default if _section is None else _section.get(key, default)
 
     def get_section(self, section):
         return self._values.get(section, {})
+
+    def iter_section(self, section):
+        return iter(self.get_section(section).items())
@@ -9,40 +9,40 @@ def define_handler(name):
 
 class DictObject(object):
     def __init__(self, **props):
-        for k, v in props.items():
-            if isinstance(v, dict):
-                setattr(self, k, DictObject(**v))
-            else:
-                setattr(self, k, v)
+        self.__dict__.update(
+            (k, DictObject(**v) if isinstance(v, dict) else v)
+            for k, v in props.items())
 
 @define_handler("docker.containers.list")
-def _fix_container(*containers):
-    if isinstance(containers[0], list):
-        return _fix_container(*containers[0])
-
-    return [DictObject(**container) for container in containers]
+def _fix_container(containers):
+    return [DictObject(**container) for container in containers or ()]
 
 
 class TestDocker(object):
+    __slots__ = ("name", "_value", "_values", "_calls", "_children")
+
     def __init__(self, name, *arg, **values):
         self.name = name
-        if arg:
-            self._value = arg[0]
-
+        self._value = arg[0] if arg else None
         self._values = values
+        self._calls = []  # shared with every child, see `__getattr__`
+        self._children = {}
 
     def __call__(self, *args, **kwargs):
-        value = self.__dict__.get("_value", None)
+        self._calls.append((self.name, args, kwargs))
         if self.name in handlers:
-            return handlers[self.name](value)
+            return handlers[self.name](self._value)
 
-        return value
+        return self._value
 
     def __getattr__(self, name):
-        if name in self.__dict__:
-            return getattr(self.__dict__, name)
-
-        val = self._values.get(name, {})
-        full_name = ".".join([self.name, name])
-        return TestDocker(full_name, **val) if isinstance(val, dict) \
-            else TestDocker(full_name, val)
+        child = self._children.get(name)
+        if child is None:
+            val = self._values.get(name, {})
+            full_name = self.name + "." + name
+            child = TestDocker(full_name, **val) if isinstance(val, dict) \
+                else TestDocker(full_name, val)
+            child._calls = self._calls
+            self._children[name] = child
+
+        return child
@@ -1,3 +1,4 @@
+import functools
 import unittest
 
 from .context import TestContext, TestConfig
@@ -19,11 +20,18 @@ class Invoker(object):
     pass
 
 
+@functools.lru_cache(maxsize=128)
+def _tokenize(args):
+    """CLI arguments from a test's argument string"""
+    return tuple(args.split(' ')) if args else ()
+
+
 class TestCase(unittest.TestCase):
     command_base = None
     config = {}
     docker = None
     _debug = False
+    _test_config = (None, None)  # (config it was built from, TestConfig)
 
     def setUp(self):
         self.runner = CliRunner()
@@ -45,13 +53,14 @@ class TestCase(unittest.TestCase):
             def caller(args=None, stdin=None, assrt=True, ctch=None):
                 ctch = self._debug if ctch is None else ctch
                 context = copy(self.context)
-                context.config = TestConfig(**self.config)
-                if self.docker:
-                    context._docker = TestDocker("docker", **self.docker)
+                context.config = self._get_test_config()
+                if self.docker is not None:
+                    context._docker = self.docker_client = \
+                        TestDocker("docker", **self.docker)
 
                 result = self.runner.invoke(
                         method,
-                        args.split(' ') if args else [],
+                        _tokenize(args),
                         input=stdin,
                         catch_exceptions=ctch,
                         obj=context)
@@ -75,6 +84,15 @@ class TestCase(unittest.TestCase):
 
         return invoker
 
+    def _get_test_config(self):
+        """`TestConfig` for the current config, rebuilt only if it changed"""
+        source, test_config = self._test_config
+        if source is not self.config:
+            test_config = TestConfig(**self.config)
+            self._test_config = (self.config, test_config)
+
+        return test_config
+
     def assertOutput(self, left, right):
         self.assertEqual(left.strip(), right.strip())
 
@@ -4,38 +4,75 @@ Collection of random helper functions that are designed to be simple and
 shareable for.  Basically a cop-out in scope definition but also kind of the
 catchall for misc helpers.
 """
+import collections
+import contextlib
 import functools
 import importlib
+import itertools
 import logging
 import os
 import os.path
 
 import click
 
-HOME = os.path.expanduser("~")
+
+@functools.lru_cache(maxsize=None)
+def home():
+    """The user's home directory (resolved once, `home.cache_clear()` resets)"""
+    return os.path.expanduser("~")
 
 
 def align_table(table_data, max_length=99999, min_length=1, seperator=" "):
     """Align columnar data for output
 
     Takes a 2 dimensional set of data consisting of rows of columns and formats
-    each row to align in columns with each other.  Relies on the built in
-    string formatting system to generate each line.  The `max_length` argument
-    allows for limiting how wide a column can be.
+    each row to align in columns with each other, padding each cell out to its
+    column's width.  The `max_length` argument allows for limiting how wide a
+    column is padded to (longer values are not cut).
+
+    The rows can come from any iterable (like a generator), they are only
+    gathered once and the column widths are found in a single transposing
+    pass over them.
 
-    NOTE: Uses the first row as an indicator of column number, if any rows are
-    of different size, they will either error (if shorter) or truncate (if
-    longer).
+    NOTE: Uses the shortest row as an indicator of column number, if any rows
+    are longer, the extra columns are truncated.
     """
-    format_str = ""
-    for column in range(len(table_data[0])):
-        width = max(min_length, *[len(row[column]) for row in table_data])
-        format_str += "{:" + \
-            str(min(max_length, width)) + \
-            "}" + seperator
+    table_data = list(table_data)
+    widths = [min(max_length, max(min_length, *map(len, column)))
+              for column in zip(*table_data)]
 
     for row in table_data:
-        yield format_str.format(*row)
+        yield "".join(cell.ljust(width) + seperator
+                      for cell, width in zip(row, widths))
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode="w"):
+    """Write to a file by replacing it once the write is complete
+
+    Yields a file object for a temporary file next to `path` which is renamed
+    over `path` when the context exits cleanly (keeping the permissions of the
+    file being replaced, or the umask defaults for a new file).  If anything
+    fails, the temporary file is removed and the original is left untouched.
+    """
+    import shutil
+    import tempfile
+
+    handle, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=".den-", suffix=".tmp")
+    try:
+        with os.fdopen(handle, mode) as f:
+            yield f
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        else:  # `mkstemp` creates it private, new files follow the umask
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
 
 
 def base_dir(*matches):
@@ -43,21 +80,25 @@ def base_dir(*matches):
 
     These indicators are files to look in the directory to indicate that it is
     the base directory to work out.  Example using `.git` will find the base
-    directory of a git repositor.
+    directory of a git repositor.  The walk is done on the path itself, probing
+    each candidate with a single `access` existence check (so a `.git` file,
+    like in a worktree, counts too), rather than changing directories.
     """
     if not matches:
         matches = [".git"]
 
-    directory = os.getcwd()
-    while not any([os.path.exists(m) for m in matches]):
-        os.chdir("..")
-        if os.getcwd() == "/" or os.getcwd() == HOME:
-            os.chdir(directory)
-            break
+    terminal_dirs = (os.sep, home())  # where the climb stops
+    start = directory = os.getcwd()
+    while not any(os.access(os.path.join(directory, m), os.F_OK)
+                  for m in matches):
+        parent = os.path.dirname(directory)
+        # a path can top out somewhere other than the terminal dirs (`//` or
+        # a drive root), where it is its own parent
+        if parent == directory or parent in terminal_dirs:
+            return start
+        directory = parent
 
-    value = os.getcwd()
-
-    return value
+    return directory
 
 
 def bind_module(module_name, parent_cmd):
@@ -68,34 +109,43 @@ def bind_module(module_name, parent_cmd):
     desired handling of members of a module rather than just inferring based on
     their class type.
     """
-    module = importlib.import_module(module_name, __name__)
-    if hasattr(module, "__commands__"):
-        targets = getattr(module, "__commands__")
-    else:
-        targets = dir(module)
+    bind_modules([module_name], parent_cmd)
+
 
-    for member_name in targets:
-        member = getattr(module, member_name)
-        if isinstance(member, click.Command):
-            parent_cmd.add_command(member)
+@functools.lru_cache(maxsize=None)
+def _import(module_name):
+    """Memoized module import for binding commands"""
+    return importlib.import_module(module_name, __name__)
 
 
-def cached_property(func):
-    """Property decorator that creates a cached/memoized member variable
+def bind_modules(module_names, parent_cmd):
+    """Binds commands from a set of modules to a parent subcommand at once
 
-    Like the `@property` decorator but only determines the value once and then
-    caches it in a `_` prefixed member variable.
+    Collects the commands of each module the same way as `bind_module` and
+    registers each of them with the parent's `add_command` (so groups that
+    track their commands, like `SmartGroup`, stay up to date).
     """
-    cached_name = "_" + func.__name__
+    commands = {}
+    for module_name in module_names:
+        module = _import(module_name)
+        if hasattr(module, "__commands__"):
+            targets = getattr(module, "__commands__")
+        else:  # the module's public namespace, `dir` would copy and sort it
+            targets = [name for name in vars(module)
+                       if not name.startswith("_")]
+
+        for member_name in targets:
+            member = getattr(module, member_name)
+            if isinstance(member, click.Command):
+                commands[member.name] = member
 
-    def cached_caller(self):
-        """decorated function"""
-        if not hasattr(self, cached_name):
-            setattr(self, cached_name, func(self))
+    for command in commands.values():
+        parent_cmd.add_command(command)
 
-        return getattr(self, cached_name)
 
-    return property(cached_caller)
+# the value is stored in the instance `__dict__` under the property's own name,
+# so once set, lookups never call back into python (kept here for the imports)
+cached_property = functools.cached_property
 
 
 def dict_merge(*srcs, **kwargs):
@@ -107,28 +157,34 @@ def dict_merge(*srcs, **kwargs):
     If you use the `_deep` keyword, any values that are dictionaries will be
     merged rather than overwritten.
     """
+    deep = kwargs.pop("_deep", False)  # don't merge the special keyword
+    sources = (src for src in itertools.chain(srcs, (kwargs,))  # kwargs last
+               if isinstance(src, dict))
+
+    if not deep:  # shallow merges are just updates, skip the per key work
+        # copying the first source sizes the table for it in one go, rather
+        # than growing an empty dict through a series of resizes
+        merged_dict = dict(next(sources, {}))
+        update = merged_dict.update
+        for src in sources:
+            update(src)
+        return merged_dict
+
+    # walked breadth first with a queue of (target, source) dicts rather than
+    # recursing, sources are visited in order at every level so later ones
+    # still take precedence
     merged_dict = {}
-    deep = kwargs.get("_deep", False)
-    def deep_merge(key, value):  # the recursive check and call
-        """Recursive merging check
-        This will deep merge dictionary values, otherwise it will overwrite
-        """
-        if isinstance(value, dict):
-            merged_dict[key] = dict_merge(merged_dict.get(key, {}),
-                                          value, _deep=deep)
-        else:
-            merged_dict[key] = value
-
-    if "_deep" in kwargs:  # don't merge the special keyword
-        del kwargs["_deep"]
-
-    for src in list(srcs) + [kwargs]:  # toss kwargs on end
-        if isinstance(src, dict):
-            if deep:  # loop through k-v pairs if deep merging
-                for key, val in src.items():
-                    deep_merge(key, val)
+    pending = collections.deque((merged_dict, src) for src in sources)
+    while pending:
+        target, src = pending.popleft()
+        for key, val in src.items():
+            if isinstance(val, dict):  # merged into a new dict, never `val`
+                nested = target.get(key)
+                if not isinstance(nested, dict):
+                    nested = target[key] = {}
+                pending.append((nested, val))
             else:
-                merged_dict.update(src)
+                target[key] = val
 
     return merged_dict
 
@@ -139,11 +195,38 @@ class DockerConnectionException(click.ClickException):
     this.
     """
     def __init__(self, cause):
-        msg = ("{}, ensure that docker is running and that you have "
-               "permissions to talk to it.").format(cause)
+        msg = (f"{cause}, ensure that docker is running and that you have "
+               "permissions to talk to it.")
         click.ClickException.__init__(self, msg)
 
 
+class DockerAPIException(click.ClickException):
+    """Exception raised when the docker daemon rejects an API request, such as
+    referencing a container that doesn't exist.
+    """
+    def __init__(self, error):
+        click.ClickException.__init__(
+            self, getattr(error, "explanation", None) or str(error))
+
+
+@contextlib.contextmanager
+def docker_errors():
+    """Context converting docker API errors into a clean `ClickException`"""
+    from docker.errors import APIError
+
+    try:
+        yield
+    except APIError as error:
+        raise DockerAPIException(error)
+
+
+@functools.lru_cache(maxsize=None)
+def _connection_error():
+    """The `requests` connection error (only imported once it is needed)"""
+    from requests.exceptions import ConnectionError as RequestsConnectionError
+    return RequestsConnectionError
+
+
 def uses_docker(func):
     """Docker execution decorator
 
@@ -154,8 +237,6 @@ def uses_docker(func):
     """
     log = logging.getLogger(__name__)
 
-    from requests.exceptions import ConnectionError as RequestsConnectionError
-
     @functools.wraps(func)
     def capture_function(*args, **kwargs):
         """Decorated wrapper around capturing docker related errors and raising
@@ -165,9 +246,12 @@ def uses_docker(func):
         if args and hasattr(args[0], "debug"):
             debug = args[0].debug
 
+        # `requests` comes with the docker client, so importing it here (once
+        # a command runs) instead of when decorating keeps it off the startup
+        connection_error = _connection_error()
         try:
             func(*args, **kwargs)
-        except RequestsConnectionError:
+        except connection_error:
             log.error("Docker connection failed.")
             if debug:
                 raise
@@ -1,7 +1,39 @@
 import den.test
+import os
+import tempfile
 
 from den.commands import alias
 
 
 class AliasTest(den.test.TestCase):
     command_base = alias
+
+    def setUp(self):
+        # create a temporary place to write to
+        den.test.TestCase.setUp(self)
+        self.context.cwd = tempfile.mkdtemp()
+
+    def tearDown(self):
+        # clean up the temporary target directory
+        den.test.TestCase.tearDown(self)
+        config_file = os.path.join(self.context.cwd, ".den.ini")
+        if os.path.exists(config_file):
+            os.remove(config_file)
+        os.rmdir(self.context.cwd)
+
+    def test_set_and_get(self):
+        """`den alias <alias> [<command>]`
+        Defining an alias and then looking it up reports the expansion.
+        """
+        self.invoke.interact_alias("crst -- create --start")
+        result = self.invoke.interact_alias("crst")
+        self.assertOutput(result.output,
+                          "den crst is aliased to den create --start")
+
+    def test_undefined(self):
+        """`den alias <alias>`
+        Looking up an alias that isn't defined fails with a clean error.
+        """
+        result = self.invoke.interact_alias("crst", assrt=False)
+        self.assertEqual(result.exit_code, 1)
+        self.assertOutput(result.output, "Error: No `crst` alias defined.")
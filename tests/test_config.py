@@ -1,12 +1,11 @@
 import den.test
 import os
 import tempfile
+import unittest
 
-try:
-    from ConfigParser import ConfigParser
-except ImportError:
-    from configparser import ConfigParser
+from configparser import ConfigParser
 from den.commands import config
+from den.config import Config, read_ini, section_options
 
 
 class ConfigTest(den.test.TestCase):
@@ -83,6 +82,15 @@ class ConfigTest(den.test.TestCase):
         self.assertEqual(result.exit_code, 1)
         self.assertOutput(result.output, "Error: No `foo.baz` option defined.")
 
+    def test_get_section(self):
+        """`den config get <section>`
+        Without a key, every option in the section is listed.
+        """
+        self.invoke.config_group("set foo bar baz")
+        self.invoke.config_group("set foo qux quux")
+        result = self.invoke.config_group("get foo")
+        self.assertOutput(result.output, "foo.bar = baz\nfoo.qux = quux")
+
     def test_get_combined(self):
         """`den config get <section>.<key>
         Ensures that the combined formation of `<section>.<key>` works along
@@ -91,3 +99,89 @@ class ConfigTest(den.test.TestCase):
         self.invoke.config_group("set foo bar baz")
         result = self.invoke.config_group("get foo.bar")
         self.assertOutput(result.output, "foo.bar = baz")
+
+    def test_literal_percent(self):
+        """`den config set <section> <key> <value with %>`
+        Values are stored as written, a `%` is not treated as interpolation.
+        """
+        self.invoke.config_group("set foo bar 100%")
+        self.invoke.config_group("set foo qux quux")
+        result = self.invoke.config_group("get foo bar")
+        self.assertOutput(result.output, "foo.bar = 100%")
+
+    def test_get_default_section(self):
+        """`den config get <section> <key>`
+        Options in the `DEFAULT` section apply to every section, unless the
+        section sets them itself.
+        """
+        with open(self.context.target_config, "w") as f:
+            f.write("[DEFAULT]\nbar = default\nqux = default\n\n"
+                    "[foo]\nqux = quux\n")
+        result = self.invoke.config_group("get foo bar")
+        self.assertOutput(result.output, "foo.bar = default")
+        result = self.invoke.config_group("get foo qux")
+        self.assertOutput(result.output, "foo.qux = quux")
+
+
+class ReadIniTest(unittest.TestCase):
+    def write(self, text):
+        """Path to a temporary file holding `text`"""
+        handle, path = tempfile.mkstemp(suffix=".ini")
+        self.addCleanup(os.remove, path)
+        with os.fdopen(handle, "w") as f:
+            f.write(text)
+        return path
+
+    def read(self, text):
+        """`read_ini` of a temporary file holding `text`"""
+        return read_ini(self.write(text))
+
+    def test_comments(self):
+        """Comment lines, with either `#` or `;`, are skipped."""
+        self.assertEqual(
+            self.read("# comment\n[foo]\n; comment\nbar = baz\n  # comment\n"),
+            {"foo": {"bar": "baz"}})
+
+    def test_delimiters(self):
+        """Options are split on `=` or `:`, whichever comes first."""
+        self.assertEqual(
+            self.read("[foo]\nbar = baz\nqux: quux\nurl = http://host\n"),
+            {"foo": {"bar": "baz", "qux": "quux", "url": "http://host"}})
+
+    def test_continuation(self):
+        """Indented lines continue the previous option's value."""
+        self.assertEqual(
+            self.read("[foo]\nbar = baz\n    qux\n\tquux\nnext = 1\n"),
+            {"foo": {"bar": "baz\nqux\nquux", "next": "1"}})
+
+    def test_lowercase_keys(self):
+        """Keys are lowercased, section names and values are not."""
+        self.assertEqual(self.read("[Foo]\nBar = Baz\n"),
+                         {"Foo": {"bar": "Baz"}})
+
+    def test_before_section(self):
+        """Options before the first section header are ignored."""
+        self.assertEqual(self.read("bar = baz\n[foo]\nqux = quux\n"),
+                         {"foo": {"qux": "quux"}})
+
+    def test_missing_file(self):
+        """A file that doesn't exist reads as empty."""
+        self.assertEqual(read_ini("/nonexistent/den-test.ini"), {})
+
+    def test_default_section(self):
+        """`[DEFAULT]` options fill in every section, but don't override."""
+        local = self.write(
+            "[DEFAULT]\nbar = default\nqux = default\n[foo]\nqux = quux\n")
+        sections = read_ini(local)
+        self.assertEqual(section_options(sections, "foo"),
+                         {"bar": "default", "qux": "quux"})
+        self.assertEqual(section_options(sections, "DEFAULT"),
+                         {"bar": "default", "qux": "default"})
+        self.assertIsNone(section_options(sections, "missing"))
+
+        # defaults from a later file apply to sections from earlier ones
+        config = Config(local, self.write("[DEFAULT]\nbar = user\n[other]\n"))
+        self.assertEqual(config.get("foo", "bar"), "user")
+        self.assertEqual(config.get("foo", "qux"), "quux")
+        self.assertEqual(config.get("other", "qux"), "default")
+        self.assertIsNone(config.get("missing", "bar"))
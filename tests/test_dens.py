@@ -18,16 +18,33 @@ class DensTest(den.test.TestCase):
 
     def tearDown(self):
         if self.command_base:
-            self.shell.stop()
+            self.shell_patch.stop()
 
     def assertExecuted(self, *cmds):
+        """Asserts the commands run, compared argument by argument
+
+        Commands are either argument lists or strings, which are split on
+        whitespace (so can only be used for arguments without spaces).
+        """
         self.shell.assert_called()
 
         for idx, cmd in enumerate(cmds):
-            self.assertEquals(self.shell.call_args_list[idx][0], tuple([cmd]))
+            args = self.shell.call_args_list[idx][0][0]
+            if isinstance(cmd, str):
+                cmd = cmd.split()
+            if isinstance(args, str):
+                args = args.split()
+            self.assertEqual(list(args), cmd)
 
         self.shell.reset_mock()
 
+    def assertDockerCalled(self, *calls):
+        """Asserts the docker API calls made, as `(method, args, kwargs)`
+
+        Calls can be made concurrently, so their order isn't checked.
+        """
+        self.assertCountEqual(self.docker_client._calls, calls)
+
 
 class DenCreateTest(DensTest):
     config = {"image": {"default": "foo"}}
@@ -89,6 +106,17 @@ class DenCreateTest(DensTest):
                                 "--label den --name test --tty --volume "
                                 "/test/:/src foo /bin/echo")
 
+    def test_cwd_with_space(self):
+        """ `den create` in a directory with a space in its path
+        The mounted path is passed as a single argument, not split apart.
+        """
+        self.context.cwd = "/test dir"
+        self.invoke.create_den("test")
+        self.assertExecuted([
+            "docker", "create", "--hostname", "test", "--interactive",
+            "--label", "den", "--name", "test", "--tty",
+            "--volume", "/test dir/:/src", "foo"])
+
     @den.test.with_config(ports={"9000": "9001", "80": "8080"})
     def test_ports(self):
         """ Configured port forwarding is honored
@@ -183,23 +211,36 @@ class DenStartTest(DensTest):
 
 
 class DenStopTest(DensTest):
+    docker = {}
+
     def test_basic(self):
         """ `den stop`
         Stops the container, either by the default name or specified via a CLI
         argument.
         """
         self.invoke.stop_den()
-        self.assertExecuted("docker stop --time 1 {}"
-                            .format(self.context.default_name))
+        self.assertDockerCalled(
+            ("docker.api.stop", (self.context.default_name,), {"timeout": 1}))
 
         self.invoke.stop_den("explicit")
-        self.assertExecuted("docker stop --time 1 explicit")
+        self.assertDockerCalled(
+            ("docker.api.stop", ("explicit",), {"timeout": 1}))
+
+    def test_delete(self):
+        """ `den stop --delete`
+        Should stop the container and then remove it, a mixture of stop and
+        delete.
+        """
+        self.invoke.stop_den("--delete explicit")
+        self.assertDockerCalled(
+            ("docker.api.stop", ("explicit",), {"timeout": 1}),
+            ("docker.api.remove_container", ("explicit",), {"force": True}))
 
 
 class DenDeleteTest(DensTest):
     docker = {
-        "containers": {
-            "list": [{"name": "foo"}, {"name": "bar"}]
+        "api": {
+            "containers": [{"Names": ["/foo"]}, {"Names": ["/bar"]}]
         }
     }
 
@@ -209,12 +250,18 @@ class DenDeleteTest(DensTest):
         CLI argument.
         """
         self.invoke.delete_den()
-        self.assertExecuted("docker rm --force {}"
-                            .format(self.context.default_name))
+        self.assertDockerCalled(
+            ("docker.api.remove_container", (self.context.default_name,),
+             {"force": True}))
 
         self.invoke.delete_den("explicit")
+        self.assertDockerCalled(
+            ("docker.api.remove_container", ("explicit",), {"force": True}))
 
-        self.assertExecuted("docker rm --force explicit")
+        self.invoke.delete_den("foo bar")
+        self.assertDockerCalled(
+            ("docker.api.remove_container", ("foo",), {"force": True}),
+            ("docker.api.remove_container", ("bar",), {"force": True}))
 
     def test_all(self):
         """ `den delete --all`
@@ -224,19 +271,20 @@ class DenDeleteTest(DensTest):
             self.invoke.delete_den("--all")
             confirmation.assert_called_once()
 
-        self.assertExecuted("docker rm --force foo", "docker rm --force bar")
+        self.assertDockerCalled(
+            ("docker.api.containers", (),
+             {"all": True, "filters": {"label": "den"}}),
+            ("docker.api.remove_container", ("foo",), {"force": True}),
+            ("docker.api.remove_container", ("bar",), {"force": True}))
 
 
 class DenListTest(DensTest):
     docker = {
-        "containers": {
-            "list": [
-                {
-                    "name": "foo", "status": "running",
-                    "image": {"tags": ["image_foo"]}},
-                {
-                    "name": "bar", "status": "ready",
-                    "image": {"tags": [], "short_id": "image_bar"}}
+        "api": {
+            "containers": [
+                {"Names": ["/foo"], "State": "running", "Image": "image_foo"},
+                {"Names": ["/bar"], "State": "created",
+                 "Image": "sha256:0123456789abcdef"}
             ]
         }
     }
@@ -251,5 +299,5 @@ class DenListTest(DensTest):
                 "\n".join(list(align_table([
                     ["NAME", "STATUS", "IMAGE"],
                     ["foo", "running", "image_foo"],
-                    ["bar", "ready", "image_bar"]
+                    ["bar", "created", "sha256:0123456789"]
                 ], min_length=8))))
@@ -0,0 +1,63 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import types
+import unittest
+
+from mock import patch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import fastentrypoints  # noqa: E402 pylint: disable=wrong-import-position
+
+
+class SetupTest(unittest.TestCase):
+    def setUp(self):
+        self.target = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.target)
+
+    def test_install(self):
+        """`python setup.py install`
+        Installs with the setuptools in the environment, writing a `den`
+        launcher that imports the entry point directly.
+        """
+        subprocess.check_call(
+            [sys.executable, "setup.py", "-q",
+             "egg_info", "--egg-base", self.target,
+             "build", "--build-base", os.path.join(self.target, "build"),
+             "install", "--root", os.path.join(self.target, "root"),
+             "--single-version-externally-managed",
+             "--record", os.path.join(self.target, "record")],
+            cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        with open(os.path.join(self.target, "record")) as f:
+            scripts = [path for path in f.read().splitlines()
+                       if os.path.basename(path) == "den"]
+        self.assertEqual(len(scripts), 1)
+        with open(os.path.join(self.target, "root") + scripts[0]) as f:
+            self.assertIn("from den import main", f.read())
+
+    @unittest.skipIf(fastentrypoints.easy_install is None,
+                     "setuptools has no easy_install to patch")
+    def test_metadata_distribution(self):
+        """Distributions without the `pkg_resources` API (`importlib.metadata`
+        ones from newer setuptools) are handed to the original `get_args`.
+        """
+        calls = []
+
+        def original(cls, dist, header=None):
+            calls.append((cls, dist, header))
+            yield "args"
+
+        dist = object()  # no `get_entry_map`
+        writer = fastentrypoints.easy_install.ScriptWriter
+        with patch.object(fastentrypoints, "_original_get_args",
+                          types.SimpleNamespace(__func__=original)):
+            self.assertEqual(list(writer.get_args(dist, "#!python")),
+                             ["args"])
+        self.assertEqual(calls, [(writer, dist, "#!python")])
@@ -0,0 +1,74 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from den import shell
+from mock import patch
+
+
+class RunTest(unittest.TestCase):
+    def test_arguments(self):
+        """`shell.run([...])`
+        List arguments are passed through as is, spaces included.
+        """
+        self.assertEqual(shell.run(
+            [sys.executable, "-c", "import sys; sys.exit(sys.argv[1:] != "
+             "['a b'])", "a b"], suppress=True), 0)
+
+    def test_missing_command(self):
+        """`shell.run(<command not on $PATH>)`
+        A command that can't be found fails like `subprocess` does.
+        """
+        with self.assertRaises(FileNotFoundError):
+            shell.run("den-test-missing-command")
+
+    def make_command(self):
+        """Directory holding a `den-test-command` script (exiting with 3)"""
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        script = os.path.join(path, "den-test-command")
+        with open(script, "w") as f:
+            f.write("#!/bin/sh\nexit 3\n")
+        os.chmod(script, 0o755)
+        return path
+
+    def test_env_path(self):
+        """`shell.run(..., env={"PATH": ...})`
+        The command is looked up on the `PATH` of the passed environment
+        rather than the current one.
+        """
+        path = self.make_command()
+        self.assertEqual(shell.run("den-test-command", suppress=True,
+                                   env={"PATH": path}), 3)
+        with self.assertRaises(FileNotFoundError):
+            shell.run("den-test-command")
+
+    def test_env_without_path(self):
+        """`shell.run(..., env={<no PATH>})`
+        An environment without a `PATH` falls back to the default search
+        path (as `subprocess` does), not the current `$PATH`.
+        """
+        path = self.make_command()
+        with patch.dict(os.environ,
+                        {"PATH": path + os.pathsep + os.environ["PATH"]}):
+            self.assertEqual(shell.run("den-test-command", suppress=True), 3)
+            with self.assertRaises(FileNotFoundError):
+                shell.run("den-test-command", env={"DEN_TEST": "1"})
+            self.assertEqual(shell.run("sh -c exit", suppress=True,
+                                       env={"DEN_TEST": "1"}), 0)
+
+    def test_descriptors_closed(self):
+        """`shell.run(...)`
+        Inheritable descriptors of the current process are not passed on to
+        the command.
+        """
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        self.addCleanup(os.close, write_fd)
+        os.set_inheritable(write_fd, True)
+
+        self.assertEqual(shell.run(
+            [sys.executable, "-c",
+             "import os, sys; os.fstat(int(sys.argv[1]))", str(write_fd)], quiet=shell.STDERR, suppress=True), 1)
@@ -0,0 +1,112 @@
+import copy
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+
+import click
+
+from den.click_ext import SmartGroup
+from den.utils import base_dir, bind_module, dict_merge
+from mock import patch
+
+
+class DictMergeTest(unittest.TestCase):
+    def test_shallow(self):
+        """Later sources (then keyword arguments) win, nested dicts are
+        replaced rather than merged.
+        """
+        self.assertEqual(
+            dict_merge({"a": 1, "b": {"c": 1}}, None, {"b": {"d": 2}}, a=3),
+            {"a": 3, "b": {"d": 2}})
+
+    def test_deep_dict_over_scalar(self):
+        """A dict from a later source replaces an earlier scalar."""
+        self.assertEqual(dict_merge({"a": 1}, {"a": {"b": 2}}, _deep=True),
+                         {"a": {"b": 2}})
+
+    def test_deep_scalar_over_dict(self):
+        """A scalar from a later source replaces an earlier dict."""
+        self.assertEqual(dict_merge({"a": {"b": 1}}, {"a": 2}, _deep=True),
+                         {"a": 2})
+
+    def test_deep_many_sources(self):
+        """Nested dicts are merged level by level across every source, each
+        source taking precedence over the ones before it.
+        """
+        self.assertEqual(dict_merge(
+            {"a": {"b": {"c": 1, "d": 1}, "e": 1}, "f": 1},
+            {"a": {"b": {"c": 2}}, "f": {"g": 2}},
+            {"a": {"b": {"d": 3}, "e": {"h": 3}}},
+            {"a": {"b": 4}, "f": {"i": 4}},
+            {"a": {"b": {"j": 5}}},
+            _deep=True), {
+                "a": {"b": {"j": 5}, "e": {"h": 3}},
+                "f": {"g": 2, "i": 4},
+            })
+
+    def test_sources_unchanged(self):
+        """The sources are never modified, and a deep merge doesn't share
+        any of their nested dicts with the result.
+        """
+        srcs = ({"a": {"b": {"c": 1}}, "d": 1},
+                {"a": {"b": {"e": 2}}, "d": {"f": 2}},
+                {"a": {"g": 3}})
+        expected = copy.deepcopy(srcs)
+
+        merged = dict_merge(*srcs)
+        merged["x"] = "modified"
+        self.assertEqual(srcs, expected)
+
+        merged = dict_merge(*srcs, _deep=True)
+        self.assertEqual(srcs, expected)
+        for nested in (merged["a"], merged["a"]["b"], merged["d"]):
+            nested["x"] = "modified"
+        self.assertEqual(srcs, expected)
+
+
+class BaseDirTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.nested = os.path.join(self.root, "a", "b")
+        os.makedirs(self.nested)
+
+    def test_found(self):
+        """The nearest parent holding one of the matches is returned."""
+        open(os.path.join(self.root, ".den.ini"), "w").close()
+        with patch("os.getcwd", return_value=self.nested):
+            self.assertEqual(base_dir(".git", ".den.ini"), self.root)
+
+    def test_not_found(self):
+        """Without a match, the starting directory is returned."""
+        with patch("os.getcwd", return_value=self.nested):
+            self.assertEqual(base_dir(".den-test"), self.nested)
+
+    def test_own_parent(self):
+        """A climb that tops out outside the terminal dirs still stops."""
+        with patch("os.getcwd", return_value="//den-test"):
+            self.assertEqual(base_dir(".den-test"), "//den-test")
+
+
+class BindModuleTest(unittest.TestCase):
+    def setUp(self):
+        module = types.ModuleType("den_test_commands")
+        module.later = click.Command("later")
+        module._private = click.Command("private")
+        sys.modules[module.__name__] = module
+        self.addCleanup(sys.modules.pop, module.__name__)
+
+    def test_smart_group(self):
+        """Commands bound to a `SmartGroup` are picked up by its (cached)
+        command listing and shorthand lookups.
+        """
+        group = SmartGroup("den", commands={"list": click.Command("list")})
+        context = click.Context(group)
+        self.assertEqual(group.list_commands(context), ["list"])
+
+        bind_module("den_test_commands", group)
+        self.assertEqual(group.list_commands(context), ["later", "list"])
+        self.assertEqual(group.get_command(context, "la").name, "later")